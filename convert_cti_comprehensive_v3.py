@@ -7,95 +7,197 @@ Full PEP8 compliance with enhanced efficiency and better field mapping.
 """
 
 import argparse
+import functools
+import io
 import json
+import mmap
+import multiprocessing
 import os
 import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (Any, Callable, Dict, Iterator, List, NamedTuple, Optional,
+                    Set, Tuple, Union)
 
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None  # type: ignore[assignment]
+
+# Array items are written in batches of this many files
+_WRITE_BATCH_SIZE = 64
+# JSON files at least this large are parsed from a memory map
+_MMAP_MIN_SIZE = 1 << 20
+
+_WS_RE = re.compile(r'\s+')
+# Strings up to this length have their cleaned form cached
+_CLEAN_CACHE_MAX_LEN = 128
+# Characters that are unsafe in filenames, plus spaces
+_UNSAFE_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?* ', '_'))
+
+# Structured fields and the source keys they are read from, by preference
+_FIELD_ALIASES = (
+    ('name', ('name', 'threat_actor_name', 'title', 'label')),
+    ('id', ('id', 'mitre_id', 'misp_id', 'standard_id')),
+    ('created', ('created', 'date_added', 'first_seen', 'created_time')),
+    ('modified', ('modified', 'last_updated', 'last_seen', 'updated_time')),
+    ('country', ('country',)),
+    ('attribution', ('attribution',)),
+    ('malpedia_url', ('malpedia_url',)),
+)
+# Source key -> (structured field, preference rank) for single-pass lookup
+_ALIAS_INDEX = {
+    alias: (field, rank)
+    for field, aliases in _FIELD_ALIASES
+    for rank, alias in enumerate(aliases)
+}
+# Description source keys, by preference
+_DESCRIPTION_FIELDS = ('description', 'summary', 'details', 'overview',
+                       'abstract')
+
 
 def clean_text(input_text: Union[str, Any]) -> str:
     """Clean and format text for markdown display."""
     if not input_text:
         return "Not specified"
-    
+
+    text = input_text if type(input_text) is str else str(input_text)
+    # Short values (IDs, countries, labels) repeat heavily across feeds
+    if len(text) <= _CLEAN_CACHE_MAX_LEN:
+        return _clean_short_str(text)
+    return _clean_str(text)
+
+
+def _clean_str(text: str) -> str:
+    """Strip and normalize whitespace in a non-empty string."""
+    # Most parsed strings are already clean; return them before stripping
+    if (text.isprintable() and '  ' not in text and
+            text[0] not in ' :' and text[-1] != ' '):
+        return text
+
     # Handle strings that start with ": " (common in security bulletins)
-    text_str = str(input_text).strip()
+    text_str = text.strip()
     if text_str.startswith(': '):
-        text_str = text_str[2:]  # Remove leading ": "
+        text_str = text_str[2:].lstrip()  # Remove leading ": "
     
-    return ' '.join(text_str.split()) if text_str else "Not specified"
+    if not text_str:
+        return "Not specified"
+    # Printable text holds no whitespace other than plain spaces, so it
+    # only needs normalizing when it contains a run of them
+    if text_str.isprintable() and '  ' not in text_str:
+        return text_str
+    return _WS_RE.sub(' ', text_str)
+
 
+_clean_short_str = functools.lru_cache(maxsize=8192)(_clean_str)
 
-def format_list_items(items: List[str], prefix: str = "-") -> str:
+
+def _clean_leaf(value: Any) -> str:
+    """Clean a scalar for display, rendering falsy non-strings literally."""
+    # Strings go straight to clean_text; anything else is converted first
+    # so that 0, False and [] print as themselves, not "Not specified"
+    if type(value) is str:
+        return clean_text(value)
+    return clean_text(str(value))
+
+
+def format_list_items(items: List[Any], prefix: str = "-") -> str:
     """Format list items for markdown display with specified prefix."""
     if not items:
         return "Not specified"
-    formatted_items = [f"{prefix} {clean_text(str(item))}" 
+    # Falsy items are skipped, so clean_text can convert the rest itself
+    formatted_items = [f"{prefix} {clean_text(item)}" 
                       for item in items if item]
     return '\n'.join(formatted_items) if formatted_items else "Not specified"
 
 
-def format_dict_as_markdown(data: Dict[str, Any], indent_level: int = 0) -> str:
-    """Format dictionary data as readable markdown."""
+def _write_dict_lines(data: Dict[str, Any], indent_level: int,
+                      write: Callable[[str], Any], lead: str = "") -> None:
+    """Write the markdown lines for a dictionary, prefixing the first."""
     if not data:
-        return "No data available"
+        write(f"{lead}No data available\n")
+        return
 
-    result = []
     indent = "  " * indent_level
 
+    # Values come from the cleaned walk output, which only builds plain
+    # dicts and lists, so exact type checks are enough
     for key, value in data.items():
-        if isinstance(value, dict):
-            result.append(f"{indent}- **{key}:**")
-            result.append(format_dict_as_markdown(value, indent_level + 1))
-        elif isinstance(value, list) and value:
-            result.append(f"{indent}- **{key}:**")
+        value_type = type(value)
+        if value_type is dict:
+            write(f"{lead}{indent}- **{key}:**\n")
+            _write_dict_lines(value, indent_level + 1, write)
+        elif value_type is list and value:
+            write(f"{lead}{indent}- **{key}:**\n")
             for item in value:
-                if isinstance(item, dict):
-                    nested = format_dict_as_markdown(item, indent_level + 2)
-                    result.append(f"{indent}  - {nested}")
+                if type(item) is dict:
+                    # Nested dict starts on the list bullet line
+                    _write_dict_lines(item, indent_level + 2, write,
+                                      f"{indent}  - ")
                 else:
-                    result.append(f"{indent}  - {clean_text(str(item))}")
+                    write(f"{indent}  - {_clean_leaf(item)}\n")
         else:
-            result.append(f"{indent}- **{key}:** {clean_text(str(value))}")
+            write(f"{lead}{indent}- **{key}:** {_clean_leaf(value)}\n")
+        lead = ""
 
-    return '\n'.join(result)
+
+def format_dict_as_markdown(data: Dict[str, Any], indent_level: int = 0) -> str:
+    """Format dictionary data as readable markdown."""
+    buffer = io.StringIO()
+    _write_dict_lines(data, indent_level, buffer.write)
+    # Drop the newline after the last line
+    return buffer.getvalue()[:-1]
 
 
 def format_section_content(value: Any) -> str:
     """Unified formatting for all section types - eliminates redundancy."""
-    if isinstance(value, list):
+    value_type = type(value)
+    if value_type is list:
         return format_list_items(value)
-    elif isinstance(value, dict):
+    elif value_type is dict:
         return format_dict_as_markdown(value)
     else:
         return clean_text(value)
 
 
-def _extract_object_type(data: Dict[Any, Any]) -> str:
+def _extract_object_type(data: Dict[Any, Any], format_type: str) -> Any:
     """Extract and determine object type with better mapping."""
-    # Check standard CTI type fields first
+    # Check standard CTI type fields first; their values are returned as
+    # found in the JSON and need not be strings
     obj_type = (data.get('type') or data.get('entity_type') or
                 data.get('category') or data.get('threat_type', ''))
     
     if obj_type:
         return obj_type
     
-    # Intelligent type detection based on data structure
-    if 'title' in data and 'summary' in data and ('url' in data or 'cve' in data):
+    # Intelligent type detection based on data structure.  The detected
+    # format already answers the bulletin and threat actor key checks:
+    # both fail unless the format is one of those two, and a bulletin
+    # can still hide behind a threat actor name
+    if format_type == 'security_bulletin':
         return 'security-bulletin'
-    
-    if 'threat_actor_name' in data:
+
+    if format_type == 'threat_actor':
+        if ('title' in data and 'summary' in data and
+                ('url' in data or 'cve' in data)):
+            return 'security-bulletin'
         return 'threat-actor'
     
-    if 'x_mitre' in str(data):
+    # Probe top-level keys and string values instead of stringifying
+    # the whole nested object
+    if any(key.startswith('x_mitre') for key in data):
         return 'mitre-object'
-    
-    if 'attack-pattern' in str(data) or 'technique' in str(data).lower():
-        return 'attack-pattern'
+
+    for key, value in data.items():
+        if 'attack-pattern' in key or 'technique' in key.lower():
+            return 'attack-pattern'
+        if type(value) is str and ('attack-pattern' in value or
+                                   'technique' in value.lower()):
+            return 'attack-pattern'
     
     if 'indicators' in data or 'iocs' in data:
         return 'indicator'
@@ -106,9 +208,7 @@ def _extract_object_type(data: Dict[Any, Any]) -> str:
 def _extract_description(data: Dict[Any, Any]) -> str:
     """Extract description with improved field mapping."""
     # Try multiple description fields in order of preference
-    description_fields = ['description', 'summary', 'details', 'overview', 'abstract']
-    
-    for field in description_fields:
+    for field in _DESCRIPTION_FIELDS:
         if field in data and data[field]:
             desc = str(data[field]).strip()
             # Handle descriptions that start with ": "
@@ -130,12 +230,16 @@ def detect_json_format(data: Dict[Any, Any]) -> str:
     if 'title' in data and 'summary' in data and ('url' in data or 'cve' in data):
         return 'security_bulletin'
     
-    if 'objects' in data and isinstance(data['objects'], list):
-        if data['objects'] and 'x_mitre' in str(data['objects'][0]):
+    objects = data.get('objects')
+    if isinstance(objects, list):
+        # Probe the first object's keys rather than stringifying it
+        first = objects[0] if objects else None
+        if (isinstance(first, dict) and
+                any(key.startswith('x_mitre') for key in first)):
             return 'mitre_attack'
         return 'stix_objects'
     
-    if 'type' in data and data['type'] == 'bundle' and 'objects' in data:
+    if data.get('type') == 'bundle' and 'objects' in data:
         return 'stix_bundle'
     
     if 'entity_type' in data or 'standard_id' in data:
@@ -151,100 +255,183 @@ def detect_json_format(data: Dict[Any, Any]) -> str:
     return 'generic'
 
 
-def extract_all_fields_comprehensive(data: Dict[Any, Any]) -> Dict[str, Any]:
-    """Comprehensively extract ALL fields from JSON data."""
-    extracted = {
-        'raw_data': {},
-        'structured_fields': {},
-        'all_keys': set(),
-        'nested_data': {}
-    }
-
-    def process_value(key: str, value: Any, parent_path: str = "") -> Any:
-        """Recursively process any value."""
-        full_path = f"{parent_path}.{key}" if parent_path else key
-        extracted['all_keys'].add(full_path)
-
-        if value is None or value == "":
-            return None
-        elif isinstance(value, str):
-            return clean_text(value)
-        elif isinstance(value, (int, float, bool)):
-            return value
-        elif isinstance(value, list):
-            if not value:
-                return []
-            processed_list = []
-            for i, item in enumerate(value):
-                if isinstance(item, dict):
-                    processed_list.append(
-                        process_dict(item, f"{full_path}[{i}]")
-                    )
+def _identity(value: Any) -> Any:
+    """Return a value unchanged."""
+    return value
+
+
+# Cleaning applied to scalar JSON values by exact type; anything else
+# is converted with str()
+_LEAF_HANDLERS = {
+    str: clean_text,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+}
+
+
+def _walk_json(data: Dict[Any, Any],
+               fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Iteratively clean a JSON object tree, collecting aliased fields."""
+    result: Dict[str, Any] = {}
+    # Work items are (source, target, source is a dict)
+    stack: List[Tuple[Any, Any, bool]] = [(data, result, True)]
+    child: Any
+    # Bound methods hoisted out of the per-node loop
+    push = stack.append
+    pop = stack.pop
+    leaf_handler = _LEAF_HANDLERS.get
+    alias_entry = _ALIAS_INDEX.get
+    intern = sys.intern
+    # Preference rank of the alias each structured field was taken from
+    ranks: Dict[str, int] = {}
+
+    while stack:
+        source, target, is_dict = pop()
+
+        if is_dict:
+            at_root = target is result
+            for k, v in source.items():
+                # Skip None, "" and [] without comparing against new objects;
+                # empty dicts are kept
+                value_type = type(v)
+                if v is None or (not v and (value_type is str or
+                                            value_type is list)):
+                    continue
+                # Interned keys are shared across every object in a run
+                key_str = intern(k) if type(k) is str else str(k)
+
+                if at_root and v:
+                    # First non-empty alias in preference order wins
+                    entry = alias_entry(k)
+                    if entry is not None:
+                        field, rank = entry
+                        if rank < ranks.get(field, len(_ALIAS_INDEX)):
+                            ranks[field] = rank
+                            fields[field] = v
+
+                if value_type is dict:
+                    target[key_str] = child = {}
+                    push((v, child, True))
+                elif value_type is list:
+                    target[key_str] = child = []
+                    push((v, child, False))
                 else:
-                    processed_item = process_value(f"item_{i}", item, full_path)
-                    if processed_item is not None:
-                        processed_list.append(processed_item)
-            return processed_list if processed_list else []
-        elif isinstance(value, dict):
-            return process_dict(value, full_path)
-        else:
-            return str(value)
-
-    def process_dict(obj: Dict[Any, Any], parent_path: str = "") -> Dict[str, Any]:
-        """Process dictionary recursively."""
-        processed = {}
-        for k, v in obj.items():
-            key_str = str(k)
-            if v is not None and v != "" and v != []:
-                processed_val = process_value(key_str, v, parent_path)
-                if processed_val is not None:
-                    processed[key_str] = processed_val
-        return processed
-
-    # Process the entire data structure
-    extracted['raw_data'] = process_dict(data)
-    extracted['structured_fields'] = extract_structured_fields(data)
-
-    return extracted
-
-
-def extract_structured_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
-    """Extract commonly expected fields efficiently with improved mapping."""
-    # Enhanced extraction with better field mapping
-    fields = {
-        'name': (data.get('name') or data.get('threat_actor_name') or
-                 data.get('title') or data.get('label', '')),
-        'id': (data.get('id') or data.get('mitre_id') or
-               data.get('misp_id') or data.get('standard_id', '')),
-        'type': _extract_object_type(data),
-        'description': _extract_description(data),
-        'created': (data.get('created') or data.get('date_added') or
-                   data.get('first_seen') or data.get('created_time', '')),
-        'modified': (data.get('modified') or data.get('last_updated') or
-                    data.get('last_seen') or data.get('updated_time', '')),
-        'country': data.get('country', ''),
-        'attribution': data.get('attribution', ''),
-        'malpedia_url': data.get('malpedia_url', '')
-    }
+                    target[key_str] = leaf_handler(value_type, str)(v)
+            continue
+
+        for item in source:
+            item_type = type(item)
+            if item_type is dict:
+                child = {}
+                target.append(child)
+                push((item, child, True))
+            elif item is None or (item_type is str and not item):
+                continue
+            elif item_type is list:
+                child = []
+                target.append(child)
+                push((item, child, False))
+            else:
+                target.append(leaf_handler(item_type, str)(item))
+
+    return result
+
+
+class ExtractedData(NamedTuple):
+    """Cleaned copy of a JSON object, its structured fields and format."""
+    raw_data: Dict[str, Any]
+    structured_fields: Dict[str, Any]
+    format_type: str
+
+
+def extract_all_fields_comprehensive(data: Dict[Any, Any]) -> ExtractedData:
+    """Comprehensively extract ALL fields from JSON data."""
+    structured: Dict[str, Any] = {}
+    raw_data = _walk_json(data, structured)
+    format_type = detect_json_format(data)
+    _add_derived_fields(data, structured, format_type)
+    return ExtractedData(raw_data, structured, format_type)
+
+
+def _add_derived_fields(data: Dict[Any, Any], fields: Dict[str, Any],
+                        format_type: str) -> None:
+    """Add the structured fields that are derived rather than aliased."""
+    fields['type'] = _extract_object_type(data, format_type)
+    description = _extract_description(data)
+    if description:
+        fields['description'] = description
     
     # Handle URLs efficiently
     if 'urls' in data:
-        fields['urls'] = (data['urls'] if isinstance(data['urls'], list) 
-                         else [data['urls']])
+        urls = (data['urls'] if isinstance(data['urls'], list)
+                else [data['urls']])
     elif 'url' in data:  # Handle single URL field
-        fields['urls'] = [data['url']]
+        urls = [data['url']]
     else:
-        fields['urls'] = []
-
-    # Return only non-empty fields
-    return {k: v for k, v in fields.items() if v}
+        urls = []
+    if urls:
+        fields['urls'] = urls
+
+
+# Optional markdown sections as (section title, raw data key), in order
+_SECTIONS = (
+    ("Country", "country"),
+    ("MITRE ID", "mitre_id"),
+    ("MISP ID", "misp_id"),
+    ("Malpedia URL", "malpedia_url"),
+    ("URLs", "urls"),
+    ("CVE References", "cve"),
+    ("Vendor Names for Threat Actors", "vendor_names_for_threat_actors"),
+    ("Associated MITRE Attack Techniques",
+     "associated_mitre_attack_techniques"),
+    ("Vendors and Products Targeted", "vendors_and_products_targeted"),
+    ("MITRE Attack Group", "mitre_attack_group"),
+    ("MISP Threat Actor", "misp_threat_actor"),
+    ("Related Actors", "related_actors"),
+    ("Targeted Countries", "targeted_countries"),
+    ("Targeted Industries", "targeted_industries"),
+)
+# Structured date fields listed under Metadata as (field, label)
+_METADATA_FIELDS = (
+    ('created', 'Created'),
+    ('modified', 'Modified'),
+)
+
+
+def _dump_json(data: Dict[str, Any]) -> str:
+    """Serialize cleaned data as indented JSON for the raw data section.
+
+    orjson and json.dumps agree on layout but not on float spelling
+    (orjson writes 1e16 and 1.1e-7 where json writes 1e+16 and 1.1e-07).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # orjson refuses data nested deeper than 254 levels (and
+            # integers wider than 64 bits); the stdlib encoder has no
+            # such fixed limit
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _markdown_footer(format_type: str) -> str:
+    """Build the document footer once per detected format."""
+    format_title = format_type.replace('_', ' ').title()
+    return (f"---\n*Generated from {format_title} CTI data*\n"
+            "*All available data from the original JSON has been included above*")
 
 
-def generate_comprehensive_markdown(comprehensive_data: Dict[str, Any], 
-                                  format_type: str) -> str:
-    """Generate optimized markdown content using list-based building."""
-    structured = comprehensive_data['structured_fields']
-    raw_data = comprehensive_data['raw_data']
+def generate_comprehensive_markdown(comprehensive_data: ExtractedData) -> str:
+    """Generate markdown content using list-based building."""
+    content_parts: List[str] = []
+    write = content_parts.append
+    structured = comprehensive_data.structured_fields
+    raw_data = comprehensive_data.raw_data
     
     # Cache cleaned values to avoid redundant processing
     name = clean_text(structured.get('name', 'Unknown Object'))
@@ -255,53 +442,25 @@ def generate_comprehensive_markdown(comprehensive_data: Dict[str, Any],
     # Create title with ID if available
     title = f"# {obj_id}: {name}" if obj_id and obj_id != name else f"# {name}"
 
-    # Use list-based building for optimal performance
-    content_parts = [
-        f"{title}\n\n## Overview\n{description}\n\n## Object Type\n{obj_type}\n"
-    ]
-
-    # Optimized section mapping reduces code duplication
-    SECTIONS = {
-        "Country": "country",
-        "MITRE ID": "mitre_id", 
-        "MISP ID": "misp_id",
-        "Malpedia URL": "malpedia_url",
-        "URLs": "urls",
-        "CVE References": "cve",
-        "Vendor Names for Threat Actors": "vendor_names_for_threat_actors",
-        "Associated MITRE Attack Techniques": "associated_mitre_attack_techniques",
-        "Vendors and Products Targeted": "vendors_and_products_targeted",
-        "MITRE Attack Group": "mitre_attack_group",
-        "MISP Threat Actor": "misp_threat_actor",
-        "Related Actors": "related_actors",
-        "Targeted Countries": "targeted_countries",
-        "Targeted Industries": "targeted_industries"
-    }
+    write(f"{title}\n\n## Overview\n{description}\n\n## Object Type\n{obj_type}\n\n")
 
     # Single loop with unified formatting eliminates redundancy
-    for section_title, data_key in SECTIONS.items():
+    for section_title, data_key in _SECTIONS:
         value = raw_data.get(data_key)
         if value:
             section_content = format_section_content(value)
-            content_parts.append(f"## {section_title}\n{section_content}\n")
+            write(f"## {section_title}\n{section_content}\n\n")
 
     # Add comprehensive raw data section
-    content_parts.extend([
-        "## Complete Data Structure",
-        "The following section contains all available data from the original JSON:\n",
-        "```",
-        format_dict_as_markdown(raw_data),
-        "```\n"
-    ])
+    write("## Complete Data Structure\n"
+          "The following section contains all available data from the original JSON:\n\n"
+          "```json\n")
+    write(_dump_json(raw_data))
+    write("\n```\n\n")
 
     # Build metadata efficiently
     metadata_items = []
-    metadata_fields = [
-        ('created', 'Created'),
-        ('modified', 'Modified')
-    ]
-    
-    for field_key, label in metadata_fields:
+    for field_key, label in _METADATA_FIELDS:
         if structured.get(field_key):
             metadata_items.append(f"**{label}:** {structured[field_key]}")
     
@@ -309,71 +468,112 @@ def generate_comprehensive_markdown(comprehensive_data: Dict[str, Any],
         metadata_items.append(f"**Date Added:** {raw_data['date_added']}")
 
     if metadata_items:
-        content_parts.extend([
-            "## Metadata",
-            '\n'.join(metadata_items) + '\n'
-        ])
+        write("## Metadata\n")
+        write('\n'.join(metadata_items))
+        write("\n\n")
 
-    # Add footer
-    format_title = format_type.replace('_', ' ').title()
-    content_parts.extend([
-        "---",
-        f"*Generated from {format_title} CTI data*",
-        "*All available data from the original JSON has been included above*"
-    ])
+    write(_markdown_footer(comprehensive_data.format_type))
+    return ''.join(content_parts)
 
-    return '\n'.join(content_parts)
 
+def _write_markdown(output_file: str, markdown_content: str) -> None:
+    """Write markdown content to a file."""
+    # Encode once and skip the text layer for a single buffered write
+    with open(output_file, 'wb') as f:
+        f.write(markdown_content.encode('utf-8'))
 
-def process_json_array(data: List[Dict], json_file: str, 
-                      output_dir: str) -> bool:
-    """Process a JSON array containing multiple objects."""
-    try:
-        success_count = 0
-        base_filename = os.path.splitext(os.path.basename(json_file))[0]
 
-        for i, item in enumerate(data):
-            if not isinstance(item, dict):
-                continue
+def _write_markdown_batch(pending_writes: Dict[str, str]) -> None:
+    """Write a batch of queued markdown files in order."""
+    for output_file, markdown_content in pending_writes.items():
+        _write_markdown(output_file, markdown_content)
 
-            # Get comprehensive extraction for each item
-            comprehensive_data = extract_all_fields_comprehensive(item)
-            format_type = detect_json_format(item)
-            markdown_content = generate_comprehensive_markdown(
-                comprehensive_data, format_type
-            )
-
-            # Create meaningful filename using name or index
-            item_name = comprehensive_data['structured_fields'].get(
-                'name', f'item_{i+1}'
-            )
-            # Clean filename efficiently
-            safe_name = re.sub(r'[<>:"/\\|?*]', '_', 
-                             item_name.replace(' ', '_'))
-            output_filename = f"{base_filename}_{safe_name}.md"
-            output_file = os.path.join(output_dir, output_filename)
 
-            # Create output directory
-            os.makedirs(output_dir, exist_ok=True)
+def process_json_array(data: List[Any], json_file: str, 
+                      output_dir: str) -> int:
+    """Process a JSON array and return the number of files written."""
+    try:
+        output_files: Set[str] = set()
+        base_filename = os.path.splitext(os.path.basename(json_file))[0]
+        pending_writes: Dict[str, str] = {}
+        flushes = []
+
+        # Create output directory once for every item in the array
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Full batches are handed to a single writer thread, which writes
+        # them in order while later items are rendered; the thread is only
+        # started by the first submit, so short arrays never create it
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            for i, item in enumerate(data):
+                if not isinstance(item, dict):
+                    continue
+
+                # Get comprehensive extraction for each item
+                comprehensive_data = extract_all_fields_comprehensive(item)
+                markdown_content = generate_comprehensive_markdown(
+                    comprehensive_data
+                )
+
+                # Create meaningful filename using name or index
+                item_name = comprehensive_data.structured_fields.get(
+                    'name', f'item_{i+1}'
+                )
+                # Clean filename efficiently
+                safe_name = item_name.translate(_UNSAFE_FILENAME_TABLE)
+                output_filename = f"{base_filename}_{safe_name}.md"
+                output_file = os.path.join(output_dir, output_filename)
+
+                # Queue markdown file; a repeated name keeps the last item
+                pending_writes[output_file] = markdown_content
+                if len(pending_writes) >= _WRITE_BATCH_SIZE:
+                    flushes.append(
+                        writer.submit(_write_markdown_batch, pending_writes)
+                    )
+                    pending_writes = {}
 
-            # Write markdown file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+                output_files.add(output_file)
 
-            success_count += 1
+            # Surface write errors, and keep earlier batches ahead of the rest
+            for flush in flushes:
+                flush.result()
 
-        return success_count > 0
+        # Nothing is left to render, so the last batch is written directly
+        _write_markdown_batch(pending_writes)
+        return len(output_files)
 
     except Exception as e:
         print(f"Error processing array in {json_file}: {str(e)}")
-        return False
-
-
-def process_json_file(json_file: str, output_dir: str) -> bool:
-    """Process a single JSON file and convert to markdown."""
+        return 0
+
+
+def _load_json(json_file: str) -> Any:
+    """Load a JSON file, using orjson when it is installed.
+
+    orjson reads integers outside the 64-bit range as floats (so
+    123456789012345678901234567890 becomes 1.2345678901234568e+29); the
+    stdlib parser used without orjson keeps them exact.
+    """
+    if orjson is not None:
+        # orjson parses bytes directly, skipping the text-mode decode
+        with open(json_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+                # Parse large files from a read-only mapping instead of
+                # copying them into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return orjson.loads(f.read())
+
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def process_json_file(json_file: str, output_dir: str,
+                      output_file: Optional[str] = None) -> int:
+    """Convert a JSON file to markdown and return the files written."""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _load_json(json_file)
 
         # Handle root-level arrays (common in threat intel feeds)
         if isinstance(data, list):
@@ -381,46 +581,67 @@ def process_json_file(json_file: str, output_dir: str) -> bool:
 
         # Process single object
         comprehensive_data = extract_all_fields_comprehensive(data)
-        format_type = detect_json_format(data)
-        markdown_content = generate_comprehensive_markdown(
-            comprehensive_data, format_type
-        )
 
-        # Determine output path
-        rel_path = os.path.relpath(json_file, os.path.dirname(json_file))
-        output_file = os.path.join(output_dir, rel_path.replace('.json', '.md'))
+        # Callers that pass output_file have already created output_dir
+        if output_file is None:
+            # Determine output path
+            file_name = os.path.basename(json_file)
+            output_file = os.path.join(output_dir,
+                                       file_name.replace('.json', '.md'))
 
-        # Create output directory
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            # Create output directory
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Write markdown file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        # Render fully before opening the file so a failure part way
+        # through never leaves a truncated .md behind
+        markdown_content = generate_comprehensive_markdown(comprehensive_data)
+        _write_markdown(output_file, markdown_content)
 
-        return True
+        return 1
 
     except Exception as e:
         print(f"Error processing {json_file}: {str(e)}")
-        return False
+        return 0
+
 
+def _process_task(task: Tuple[str, str, str]) -> int:
+    """Pool worker entry point: unpack a conversion task."""
+    json_file, output_dir, output_file = task
+    return process_json_file(json_file, output_dir, output_file)
 
-def print_detailed_statistics(output_path: str) -> None:
+
+def print_detailed_statistics(total_md_files: int) -> None:
     """Print detailed statistics about the converted files."""
     print("\n" + "=" * 60)
     print("CONVERSION STATISTICS")
     print("=" * 60)
 
-    # Count total output files efficiently
-    total_md_files = sum(
-        len([f for f in files if f.endswith('.md')])
-        for _, _, files in os.walk(output_path)
-    )
-
+    # Files written are counted by the workers, so the output tree is
+    # not walked again
     print(f"\nTotal markdown files created: {total_md_files}")
     print("=" * 60)
 
 
-def process_directory(source_dir: str, output_dir: str) -> None:
+def _iter_tasks(source_path: Path,
+                output_path: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (json_file, output_dir, output_file) tasks during the walk."""
+    created_dirs = set()
+
+    for json_file in source_path.rglob("*.json"):
+        # Maintain directory structure in output; directories are created
+        # here, once each, so worker processes never race on mkdir
+        output_file_dir = output_path / json_file.relative_to(source_path).parent
+        if output_file_dir not in created_dirs:
+            output_file_dir.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(output_file_dir)
+        # Output paths are resolved here from the Path already in hand, so
+        # workers receive plain strings and do no path handling of their own
+        output_file = output_file_dir / json_file.name.replace('.json', '.md')
+        yield str(json_file), str(output_file_dir), str(output_file)
+
+
+def process_directory(source_dir: str, output_dir: str,
+                      count_files: bool = False) -> None:
     """Process all JSON files in a directory."""
     source_path = Path(source_dir)
     output_path = Path(output_dir)
@@ -432,40 +653,53 @@ def process_directory(source_dir: str, output_dir: str) -> None:
     # Create output directory
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Find all JSON files
-    json_files = list(source_path.rglob("*.json"))
-
-    if not json_files:
-        print(f"No JSON files found in {source_dir}")
-        return
-
     print(f"\nScanning directory for JSON files...")
-    print(f"Found {len(json_files)} JSON files to process")
 
-    # Process files with progress bar
+    # Files are streamed to the workers as they are found; counting them
+    # first is an optional extra pass that gives the progress bar a total
+    expected_files = None
+    if count_files:
+        expected_files = sum(1 for _ in source_path.rglob("*.json"))
+        if not expected_files:
+            print(f"No JSON files found in {source_dir}")
+            return
+        print(f"Found {expected_files} JSON files to process")
+
+    # Process files in parallel with progress bar
     processed_count = 0
     error_count = 0
+    total_output_files = 0
     start_time = time.time()
 
-    for json_file in tqdm(json_files, desc="Converting files", unit="files"):
-        # Maintain directory structure in output
-        rel_path = json_file.relative_to(source_path)
-        output_file_dir = output_path / rel_path.parent
-        output_file_dir.mkdir(parents=True, exist_ok=True)
-
-        if process_json_file(str(json_file), str(output_file_dir)):
-            processed_count += 1
-        else:
-            error_count += 1
+    # With a known total, size chunks so each worker gets about eight,
+    # balancing task overhead against stragglers at the end
+    workers = os.cpu_count() or 1
+    chunksize = 16
+    if expected_files:
+        chunksize = max(1, expected_files // (workers * 8))
+
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.imap_unordered(
+            _process_task, _iter_tasks(source_path, output_path),
+            chunksize=chunksize
+        )
+        for files_written in tqdm(results, total=expected_files,
+                                  desc="Converting files", unit="files"):
+            if files_written:
+                processed_count += 1
+                total_output_files += files_written
+            else:
+                error_count += 1
+        # Let workers exit cleanly so their buffered error output is flushed
+        pool.close()
+        pool.join()
+
+    total_files = processed_count + error_count
+    if not total_files:
+        print(f"No JSON files found in {source_dir}")
+        return
 
     total_time = time.time() - start_time
-    total_files = len(json_files)
-
-    # Count total output files
-    total_output_files = sum(
-        len([f for f in files if f.endswith('.md')])
-        for _, _, files in os.walk(output_path)
-    )
 
     print(f"\nConversion complete!")
     print(f"Successfully processed: {processed_count} JSON files")
@@ -478,7 +712,7 @@ def process_directory(source_dir: str, output_dir: str) -> None:
         print(f"\nNote: {error_count} files had errors. "
               f"Check the output above for details.")
 
-    print_detailed_statistics(output_dir)
+    print_detailed_statistics(total_output_files)
 
 
 def main() -> None:
@@ -499,6 +733,12 @@ def main() -> None:
              "(default: cti_markdown_comprehensive_v3)"
     )
     
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Count JSON files before converting to show overall progress"
+    )
+    
     args = parser.parse_args()
     
     print("Comprehensive CTI JSON to Markdown Converter v3")
@@ -507,7 +747,7 @@ def main() -> None:
     print(f"Output directory: {args.output_dir}")
     print("Enhanced field mapping for security bulletins and CTI data")
     
-    process_directory(args.source_dir, args.output_dir)
+    process_directory(args.source_dir, args.output_dir, args.count)
 
 
 if __name__ == "__main__":
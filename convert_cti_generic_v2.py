@@ -7,28 +7,60 @@ to markdown format. It supports MITRE ATT&CK, STIX, OpenCTI, and custom formats.
 """
 
 import argparse
+import collections
+import contextlib
+import io
 import json
+import multiprocessing
 import os
 import re
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; large arrays are then loaded whole
+    ijson = None
+
+_WS_RE = re.compile(r'\s+')
+# Characters that are unsafe in filenames, plus spaces
+_UNSAFE_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?* ', '_'))
+# Root-level arrays at least this large are streamed item by item (needs ijson)
+_STREAM_MIN_SIZE = 64 * 1024 * 1024
+# external_references sources whose external_id is the ATT&CK ID.  A tuple
+# rather than a set: source_name values are not guaranteed to be hashable
+_MITRE_ID_SOURCES = ('mitre-attack', 'mitre-ics-attack')
+# O_BINARY only exists (and matters) on Windows, where it stops os.write
+# from translating "\n".  Text-mode open() used to write CRLF there; the
+# markdown now has LF line endings on every platform
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+# Per output directory record of the sources that last converted cleanly
+_MANIFEST_NAME = '.cti_sources.json'
+
 
 def clean_text(input_text: Union[str, Any]) -> str:
     """Clean and format text for markdown display."""
     if not input_text:
         return "Not specified"
-    return ' '.join(str(input_text).split())
+    if not isinstance(input_text, str):
+        input_text = str(input_text)
+    return _WS_RE.sub(' ', input_text).strip()
 
 
 def format_list_items(items: List[str], prefix: str = "-") -> str:
     """Format list items for markdown display with specified prefix."""
     if not items:
         return "Not specified"
-    formatted_items = [f"{prefix} {clean_text(str(item))}" for item in items if item]
+    # clean_text converts non-string items itself
+    formatted_items = [f"{prefix} {clean_text(item)}" for item in items if item]
     return '\n'.join(formatted_items) if formatted_items else "Not specified"
 
 
@@ -39,8 +71,12 @@ def detect_json_format(data: Dict[Any, Any]) -> str:
         return 'stix_bundle'
     
     # MITRE ATT&CK format
-    if 'objects' in data and isinstance(data['objects'], list):
-        if data['objects'] and 'x_mitre' in str(data['objects'][0]):
+    objects = data.get('objects')
+    if isinstance(objects, list):
+        # Probe the first object's keys rather than stringifying it
+        first = objects[0] if objects else None
+        if (isinstance(first, dict) and
+                any(key.startswith('x_mitre') for key in first)):
             return 'mitre_attack'
         return 'stix_objects'
     
@@ -63,153 +99,140 @@ def detect_json_format(data: Dict[Any, Any]) -> str:
     return 'generic'
 
 
+# Fields every extraction result starts from.  The copy made per object is
+# shallow, so the empty lists are shared and must never be mutated in place
+_DEFAULT_FIELDS = {
+    'name': '',
+    'description': '',
+    'type': '',
+    'id': '',
+    'aliases': [],
+    'labels': [],
+    'platforms': [],
+    'tactics': [],
+    'techniques': [],
+    'indicators': [],
+    'references': [],
+    'created': '',
+    'modified': '',
+    'confidence': '',
+    'severity': '',
+    'attribution': ''
+}
+
+
 def extract_common_fields(data: Dict[Any, Any], format_type: str) -> Dict[str, Any]:
     """Extract common CTI fields regardless of format."""
-    fields = {
-        'name': '',
-        'description': '',
-        'type': '',
-        'id': '',
-        'aliases': [],
-        'labels': [],
-        'platforms': [],
-        'tactics': [],
-        'techniques': [],
-        'indicators': [],
-        'references': [],
-        'created': '',
-        'modified': '',
-        'confidence': '',
-        'severity': '',
-        'attribution': ''
-    }
-    
-    if format_type == 'stix_bundle':
-        obj = data.get('objects', [{}])[0] if data.get('objects') else {}
-        fields.update(extract_stix_fields(obj))
-    
-    elif format_type == 'mitre_attack':
-        obj = data.get('objects', [{}])[0] if data.get('objects') else {}
-        fields.update(extract_mitre_fields(obj))
+    fields = _DEFAULT_FIELDS.copy()
     
-    elif format_type == 'stix_objects':
-        obj = data.get('objects', [{}])[0] if data.get('objects') else {}
-        fields.update(extract_stix_fields(obj))
-    
-    elif format_type == 'stix_object':
-        fields.update(extract_stix_fields(data))
-    
-    elif format_type == 'opencti':
-        fields.update(extract_opencti_fields(data))
-    
-    elif format_type == 'threat_actor':
-        fields.update(extract_threat_actor_fields(data))
-    
-    elif format_type == 'generic_threat':
-        fields.update(extract_generic_threat_fields(data))
-    
-    else:  # generic
-        fields.update(extract_generic_fields(data))
+    # Unknown formats fall back to the generic extractor
+    extractor = _EXTRACTORS.get(format_type, extract_generic_fields)
+    fields.update(extractor(data))
     
     return fields
 
 
 def extract_stix_fields(obj: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from STIX format objects."""
+    get = obj.get  # bound once; the extractors run for every object
     return {
-        'name': obj.get('name', ''),
-        'description': obj.get('description', ''),
-        'type': obj.get('type', ''),
-        'id': obj.get('id', ''),
-        'labels': obj.get('labels', []),
-        'created': obj.get('created', ''),
-        'modified': obj.get('modified', ''),
-        'pattern': obj.get('pattern', ''),
-        'confidence': obj.get('confidence', ''),
-        'references': extract_references(obj.get('external_references', []))
+        'name': get('name', ''),
+        'description': get('description', ''),
+        'type': get('type', ''),
+        'id': get('id', ''),
+        'labels': get('labels', []),
+        'created': get('created', ''),
+        'modified': get('modified', ''),
+        'pattern': get('pattern', ''),
+        'confidence': get('confidence', ''),
+        'references': extract_references(get('external_references', []))
     }
 
 
 def extract_mitre_fields(obj: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from MITRE ATT&CK format objects."""
-    platforms = obj.get('x_mitre_platforms', [])
+    get = obj.get
+    platforms = get('x_mitre_platforms', [])
     
     # Extract tactics from kill chain phases
-    tactics = []
-    for phase in obj.get('kill_chain_phases', []):
-        if 'mitre' in phase.get('kill_chain_name', ''):
-            tactics.append(phase.get('phase_name', '').replace('-', ' ').title())
+    tactics = [phase.get('phase_name', '').replace('-', ' ').title()
+               for phase in get('kill_chain_phases', [])
+               if 'mitre' in phase.get('kill_chain_name', '')]
     
-    # Extract MITRE ID from external references
+    # Extract MITRE ID from external references; the same list also
+    # feeds the references section below
     mitre_id = ''
-    external_refs = obj.get('external_references', [])
+    external_refs = get('external_references', [])
     for ref in external_refs:
-        if ref.get('source_name') in ['mitre-attack', 'mitre-ics-attack']:
+        if ref.get('source_name') in _MITRE_ID_SOURCES:
             mitre_id = ref.get('external_id', '')
             break
     
     # Extract data sources (MITRE specific)
-    data_sources = obj.get('x_mitre_data_sources', [])
+    data_sources = get('x_mitre_data_sources', [])
     if not data_sources:
         # Try alternative data source formats
-        data_sources = obj.get('x_mitre_data_source_refs', [])
+        data_sources = get('x_mitre_data_source_refs', [])
     
     # Detection information
-    detection = obj.get('x_mitre_detection', '')
+    detection = get('x_mitre_detection', '')
     
     return {
-        'name': obj.get('name', ''),
-        'description': obj.get('description', ''),
-        'type': obj.get('type', ''),
-        'id': obj.get('id', ''),
+        'name': get('name', ''),
+        'description': get('description', ''),
+        'type': get('type', ''),
+        'id': get('id', ''),
         'mitre_id': mitre_id,
         'platforms': platforms,
         'tactics': tactics,
         'data_sources': data_sources,
         'detection': detection,
-        'aliases': obj.get('x_mitre_aliases', []),
-        'references': extract_references(obj.get('external_references', [])),
-        'created': obj.get('created', ''),
-        'modified': obj.get('modified', ''),
-        'version': obj.get('x_mitre_version', '')
+        'aliases': get('x_mitre_aliases', []),
+        'references': extract_references(external_refs),
+        'created': get('created', ''),
+        'modified': get('modified', ''),
+        'version': get('x_mitre_version', '')
     }
 
 
 def extract_opencti_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from OpenCTI format."""
+    get = data.get
     return {
-        'name': data.get('name', ''),
-        'description': data.get('description', ''),
-        'type': data.get('entity_type', ''),
-        'id': data.get('standard_id', data.get('id', '')),
-        'labels': data.get('labels', []),
-        'platforms': data.get('platforms', []),
-        'confidence': data.get('confidence', ''),
-        'created': data.get('created', ''),
-        'modified': data.get('modified', '')
+        'name': get('name', ''),
+        'description': get('description', ''),
+        'type': get('entity_type', ''),
+        'id': get('standard_id', get('id', '')),
+        'labels': get('labels', []),
+        'platforms': get('platforms', []),
+        'confidence': get('confidence', ''),
+        'created': get('created', ''),
+        'modified': get('modified', '')
     }
 
 
 def extract_generic_threat_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from generic threat intel format."""
+    get = data.get
     return {
-        'name': data.get('name', ''),
-        'description': data.get('description', ''),
-        'type': data.get('threat_type', data.get('type', '')),
-        'id': data.get('id', ''),
-        'indicators': data.get('indicators', data.get('iocs', [])),
-        'techniques': data.get('ttps', data.get('techniques', [])),
-        'attribution': data.get('attribution', ''),
-        'created': data.get('first_seen', data.get('created', '')),
-        'modified': data.get('last_seen', data.get('modified', ''))
+        'name': get('name', ''),
+        'description': get('description', ''),
+        'type': get('threat_type', get('type', '')),
+        'id': get('id', ''),
+        'indicators': get('indicators', get('iocs', [])),
+        'techniques': get('ttps', get('techniques', [])),
+        'attribution': get('attribution', ''),
+        'created': get('first_seen', get('created', '')),
+        'modified': get('last_seen', get('modified', ''))
     }
 
 
 def extract_threat_actor_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from threat actor format (VulnCheck style)."""
+    get = data.get
     # Extract CVE references
     cve_refs = []
-    for cve_ref in data.get('cve_references', []):
+    for cve_ref in get('cve_references', []):
         if 'cve' in cve_ref:
             cves = ', '.join(cve_ref['cve'])
             url = cve_ref.get('url', '')
@@ -220,13 +243,13 @@ def extract_threat_actor_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
     
     # Extract MITRE techniques
     techniques = []
-    for tech in data.get('associated_mitre_attack_techniques', []):
+    for tech in get('associated_mitre_attack_techniques', []):
         tech_name = f"{tech.get('id', '')} - {tech.get('name', '')}"
         techniques.append(tech_name)
     
     # Extract vendor/product targets
     targets = []
-    for target in data.get('vendors_and_products_targeted', []):
+    for target in get('vendors_and_products_targeted', []):
         vendor = target.get('vendor', '')
         product = target.get('product', '')
         if vendor and product:
@@ -237,26 +260,27 @@ def extract_threat_actor_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
             targets.append(product)
     
     return {
-        'name': data.get('threat_actor_name', ''),
-        'description': f"Threat actor active since {data.get('date_added', 'unknown date')}",
+        'name': get('threat_actor_name', ''),
+        'description': f"Threat actor active since {get('date_added', 'unknown date')}",
         'type': 'threat-actor',
-        'id': data.get('mitre_id', data.get('misp_id', '')),
-        'country': data.get('country', ''),
+        'id': get('mitre_id', get('misp_id', '')),
+        'country': get('country', ''),
         'references': cve_refs,
         'techniques': techniques,
         'targets': targets,
-        'created': data.get('date_added', ''),
-        'aliases': [alias.get('threat_actor_name', '') for alias in data.get('vendor_names_for_threat_actors', [])]
+        'created': get('date_added', ''),
+        'aliases': [alias.get('threat_actor_name', '') for alias in get('vendor_names_for_threat_actors', [])]
     }
 
 
 def extract_generic_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
     """Extract fields from completely generic JSON."""
+    get = data.get
     return {
-        'name': data.get('name', data.get('title', '')),
-        'description': data.get('description', data.get('summary', '')),
-        'type': data.get('type', data.get('category', '')),
-        'id': data.get('id', data.get('identifier', ''))
+        'name': get('name', get('title', '')),
+        'description': get('description', get('summary', '')),
+        'type': get('type', get('category', '')),
+        'id': get('id', get('identifier', ''))
     }
 
 
@@ -282,90 +306,116 @@ def extract_references(refs: List[Dict]) -> List[str]:
     return ref_list
 
 
+def _first_object(data: Dict[Any, Any]) -> Any:
+    """Return the first entry of a bundle's objects, or an empty dict."""
+    objects = data.get('objects')
+    return objects[0] if objects else {}
+
+
+def _extract_first_stix_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
+    """Extract STIX fields from the first object of a bundle."""
+    return extract_stix_fields(_first_object(data))
+
+
+def _extract_first_mitre_fields(data: Dict[Any, Any]) -> Dict[str, Any]:
+    """Extract MITRE ATT&CK fields from the first object of a bundle."""
+    return extract_mitre_fields(_first_object(data))
+
+
+# Field extractor for each detected format
+_EXTRACTORS = {
+    'stix_bundle': _extract_first_stix_fields,
+    'mitre_attack': _extract_first_mitre_fields,
+    'stix_objects': _extract_first_stix_fields,
+    'stix_object': extract_stix_fields,
+    'opencti': extract_opencti_fields,
+    'threat_actor': extract_threat_actor_fields,
+    'generic_threat': extract_generic_threat_fields,
+}
+
+
 def generate_markdown(fields: Dict[str, Any], format_type: str) -> str:
     """Generate markdown content from extracted fields."""
     name = clean_text(fields.get('name', 'Unknown Object'))
     obj_id = fields.get('id', '')
     obj_type = fields.get('type', 'unknown')
     
-    # Create title with ID if available
-    title = f"# {obj_id}: {name}" if obj_id and obj_id != name else f"# {name}"
+    # Create title with the MITRE ID if available, else the object ID
+    mitre_id = fields.get('mitre_id')
+    if mitre_id:
+        title = f"# {mitre_id}: {name}" if mitre_id != name else f"# {name}"
+    else:
+        title = f"# {obj_id}: {name}" if obj_id and obj_id != name else f"# {name}"
     
-    markdown_content = f"""{title}
+    # Sections are collected in a list and joined once at the end
+    parts = [f"""{title}
 
 ## Overview
 {clean_text(fields.get('description', 'Not specified'))}
 
 ## Object Type
 {obj_type}
-"""
-    
-    # Add format-specific sections
-    if fields.get('mitre_id'):
-        # Use MITRE ID in title if available
-        title = f"# {fields['mitre_id']}: {name}" if fields['mitre_id'] != name else f"# {name}"
-        markdown_content = markdown_content.replace(f"# {obj_id}: {name}", title)
-        markdown_content = markdown_content.replace(f"# {name}", title)
+"""]
     
     if fields.get('country'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Country
 {fields['country']}
-"""
+""")
     
     if fields.get('targets'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Targeted Vendors/Products
 {format_list_items(fields['targets'])}
-"""
+""")
     
     if fields.get('platforms'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Platforms
 {format_list_items(fields['platforms'])}
-"""
+""")
     
     if fields.get('tactics'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Tactics
 {format_list_items(fields['tactics'])}
-"""
+""")
     
     if fields.get('data_sources'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Data Sources
 {format_list_items(fields['data_sources'])}
-"""
+""")
     
     if fields.get('detection'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Detection
 {clean_text(fields['detection'])}
-"""
+""")
     
     if fields.get('techniques'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Techniques/TTPs
 {format_list_items(fields['techniques'])}
-"""
+""")
     
     if fields.get('indicators'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Indicators
 {format_list_items(fields['indicators'])}
-"""
+""")
     
     if fields.get('labels'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Labels
 {format_list_items(fields['labels'])}
-"""
+""")
     
     if fields.get('aliases'):
-        markdown_content += f"""
+        parts.append(f"""
 ## Known Aliases
 {format_list_items(fields['aliases'])}
-"""
+""")
     
     # Add metadata section
     metadata_items = []
@@ -381,43 +431,79 @@ def generate_markdown(fields: Dict[str, Any], format_type: str) -> str:
         metadata_items.append(f"**Pattern:** `{fields['pattern']}`")
     
     if metadata_items:
-        markdown_content += f"""
+        parts.append(f"""
 ## Metadata
 {chr(10).join(metadata_items)}
-"""
+""")
     
     # Add references
     if fields.get('references'):
-        markdown_content += f"""
+        parts.append(f"""
 ## External References
 {format_list_items(fields['references'])}
-"""
+""")
     else:
-        markdown_content += """
+        parts.append("""
 ## External References
 No external references available
-"""
+""")
     
-    markdown_content += f"""
+    parts.append(f"""
 ---
 *Generated from {format_type.replace('_', ' ').title()} CTI data*
-"""
+""")
     
-    return markdown_content
+    return ''.join(parts)
+
 
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write already-encoded markdown to path, replacing any existing file.
 
-def process_json_array(data: List[Dict], json_file: str, output_dir: str) -> bool:
-    """Process a JSON array containing multiple objects."""
+    Goes straight to os.write so small files skip the buffered text layer.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def process_json_array(data: Iterable[Any], json_file: str,
+                       output_dir: str) -> Tuple[bool, int]:
+    """Process a JSON array containing multiple objects.
+
+    data may be a list or any iterable of items, such as an ijson stream.
+    Returns whether the whole array converted and the number of distinct
+    markdown files written, including those written before a failure.
+    """
+    written_files: Set[str] = set()
     try:
-        success_count = 0
         base_filename = os.path.splitext(os.path.basename(json_file))[0]
         
+        # Create output directory once for every item in the array
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Feeds are usually uniform, so reuse the last detected format while
+        # items keep the same keys and 'type' value.  Items holding an
+        # 'objects' list are always re-detected since their contents matter
+        last_keys = None
+        last_type = None
+        last_format = ''
+        
         for i, item in enumerate(data):
             if not isinstance(item, dict):
                 continue
                 
             # Detect format for each item
-            format_type = detect_json_format(item)
+            item_type = item.get('type')
+            if (last_keys is not None and item_type == last_type
+                    and 'objects' not in item and item.keys() == last_keys):
+                format_type = last_format
+            else:
+                format_type = detect_json_format(item)
+                last_keys, last_type, last_format = item.keys(), item_type, format_type
             
             # Extract common fields
             fields = extract_common_fields(item, format_type)
@@ -428,31 +514,61 @@ def process_json_array(data: List[Dict], json_file: str, output_dir: str) -> boo
             # Create meaningful filename using name or index
             item_name = fields.get('name', f'item_{i+1}')
             # Clean filename
-            safe_name = re.sub(r'[<>:"/\\|?*]', '_', item_name.replace(' ', '_'))
+            safe_name = item_name.translate(_UNSAFE_FILENAME_TABLE)
             output_filename = f"{base_filename}_{safe_name}.md"
             output_file = os.path.join(output_dir, output_filename)
             
-            # Create output directory
-            os.makedirs(output_dir, exist_ok=True)
-            
             # Write markdown file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+            _write_bytes(output_file, markdown_content.encode('utf-8'))
             
-            success_count += 1
+            # Items sharing a name overwrite each other, so count paths
+            written_files.add(output_file)
         
-        return success_count > 0
+        return bool(written_files), len(written_files)
     
     except Exception as e:
         print(f"Error processing array in {json_file}: {str(e)}")
-        return False
+        return False, len(written_files)
+
+
+def _load_json(json_file: str) -> Any:
+    """Load a JSON file, using orjson when it is installed.
 
+    orjson reads integers outside the 64-bit range as floats (so
+    123456789012345678901234567890 becomes 1.2345678901234568e+29); the
+    stdlib parser used without orjson keeps them exact.
+    """
+    if orjson is not None:
+        # orjson parses bytes directly, skipping the text-mode decode
+        with open(json_file, 'rb') as f:
+            return orjson.loads(f.read())
 
-def process_json_file(json_file: str, output_dir: str) -> bool:
-    """Process a single JSON file and convert to markdown."""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _is_json_array(json_file: str) -> bool:
+    """Return True if the file's first non-whitespace byte opens an array."""
+    with open(json_file, 'rb') as f:
+        head = f.read(256).lstrip(b' \t\r\n')
+    return head.startswith(b'[')
+
+
+def process_json_file(json_file: str, output_dir: str) -> Tuple[bool, int]:
+    """Process a single JSON file and convert to markdown.
+
+    Returns whether the file converted and how many markdown files it wrote.
+    """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Stream giant root-level arrays so only one item is held at a time
+        if (ijson is not None
+                and os.path.getsize(json_file) >= _STREAM_MIN_SIZE
+                and _is_json_array(json_file)):
+            with open(json_file, 'rb') as f:
+                items = ijson.items(f, 'item', use_float=True)
+                return process_json_array(items, json_file, output_dir)
+        
+        data = _load_json(json_file)
         
         # Handle root-level arrays (common in threat intel feeds)
         if isinstance(data, list):
@@ -475,30 +591,69 @@ def process_json_file(json_file: str, output_dir: str) -> bool:
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
         # Write markdown file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        _write_bytes(output_file, markdown_content.encode('utf-8'))
         
-        return True
+        return True, 1
     
     except Exception as e:
         print(f"Error processing {json_file}: {str(e)}")
-        return False
-
-
-def print_detailed_statistics(output_path: str):
-    """Print detailed statistics about the converted files."""
+        return False, 0
+
+
+def _process_task(
+    task: Tuple[str, str, Optional[str]]
+) -> Tuple[str, bool, int, Optional[str], str]:
+    """Pool worker: convert one file, returning its path, status, file
+    count, category and messages."""
+    json_file, output_dir, category = task
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        success, written = process_json_file(json_file, output_dir)
+    return json_file, success, written, category, messages.getvalue()
+
+
+def _is_listed_category(name: str) -> bool:
+    """Return True for output subdirectories shown in the statistics."""
+    return not name.startswith('__') and not name.startswith('.')
+
+
+def _count_categories(output_path: str) -> Dict[str, int]:
+    """Count .md files per top-level output directory on disk.
+
+    The root level is stored under the empty string.
+    """
+    # scandir entries carry the file type from the directory read, so
+    # is_dir()/is_file() need no extra stat() per entry
+    counts = {'': 0}
+    with os.scandir(output_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if _is_listed_category(entry.name):
+                    with os.scandir(entry.path) as sub_entries:
+                        counts[entry.name] = sum(
+                            1 for sub in sub_entries if sub.name.endswith('.md'))
+            elif entry.is_file() and entry.name.endswith('.md'):
+                counts[''] += 1
+    return counts
+
+
+def print_detailed_statistics(output_path: str,
+                              category_counts: Optional[Dict[str, int]] = None):
+    """Print detailed statistics about the converted files.
+
+    category_counts maps each top-level output directory to the number of
+    .md files written directly into it ('' for the root level). When it is
+    not given the counts are read back from output_path.
+    """
     print("\n" + "=" * 60)
     print("CONVERSION STATISTICS")
     print("=" * 60)
     
-    # Get all subdirectories
-    subdirs = []
-    for item in os.listdir(output_path):
-        item_path = os.path.join(output_path, item)
-        if os.path.isdir(item_path) and not item.startswith('__') and not item.startswith('.'):
-            subdirs.append(item)
+    if category_counts is None:
+        category_counts = _count_categories(output_path)
     
-    subdirs.sort()
+    subdirs = sorted(name for name in category_counts
+                     if name and _is_listed_category(name))
     
     if subdirs:
         print("\nDirectories created:")
@@ -509,20 +664,16 @@ def print_detailed_statistics(output_path: str):
     total_md_files = 0
     category_stats = []
     
-    # Count files in each directory
     for subdir in subdirs:
-        subdir_path = os.path.join(output_path, subdir)
-        md_files = [f for f in os.listdir(subdir_path) if f.endswith('.md')]
-        count = len(md_files)
+        count = category_counts[subdir]
         total_md_files += count
         category_stats.append((subdir, count))
         print(f"  {subdir}: {count} files")
     
-    # Count root-level .md files
-    root_md_files = [f for f in os.listdir(output_path) if f.endswith('.md') and os.path.isfile(os.path.join(output_path, f))]
-    if root_md_files:
-        print(f"  Root level: {len(root_md_files)} files")
-        total_md_files += len(root_md_files)
+    root_count = category_counts.get('', 0)
+    if root_count:
+        print(f"  Root level: {root_count} files")
+        total_md_files += root_count
     
     print(f"\nTotal markdown files: {total_md_files}")
     
@@ -538,8 +689,82 @@ def print_detailed_statistics(output_path: str):
     print("=" * 60)
 
 
-def process_directory(source_dir: str, output_dir: str):
-    """Process all JSON files in a directory."""
+def _iter_tasks(source_path: Path, output_path: Path,
+                category_counts: Dict[str, int]) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Yield (json_file, output_dir, category) tasks during the walk.
+
+    Every top-level output directory met is registered in category_counts
+    with a count of 0, so directories holding only nested files still show.
+    """
+    dir_info: Dict[Path, Tuple[str, Optional[str]]] = {}
+    for json_file in source_path.rglob("*.json"):
+        rel_parent = json_file.relative_to(source_path).parent
+        info = dir_info.get(rel_parent)
+        if info is None:
+            # Maintain directory structure in output; directories are created
+            # here, once each, so worker processes never race on mkdir.  Files
+            # directly in the output root or one of its top-level directories
+            # are tallied per category; deeper files only count toward the total
+            output_file_dir = output_path / rel_parent
+            output_file_dir.mkdir(parents=True, exist_ok=True)
+            parent_parts = rel_parent.parts
+            category: Optional[str]
+            if not parent_parts:
+                category = ''
+            else:
+                category_counts.setdefault(parent_parts[0], 0)
+                category = parent_parts[0] if len(parent_parts) == 1 else None
+            info = dir_info[rel_parent] = (str(output_file_dir), category)
+        yield (str(json_file),) + info
+
+
+def _load_manifest(output_dir: str) -> Dict[str, int]:
+    """Read the source mtimes recorded in output_dir's manifest.
+
+    Maps each JSON file name that last converted successfully into
+    output_dir to its st_mtime_ns at the time.  A missing or unreadable
+    manifest is treated as empty.
+    """
+    try:
+        with open(os.path.join(output_dir, _MANIFEST_NAME), 'r',
+                  encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(output_dir: str, manifest: Dict[str, int]) -> None:
+    """Replace output_dir's manifest with the given source mtimes."""
+    data = json.dumps(manifest, indent=0, sort_keys=True).encode('utf-8')
+    _write_bytes(os.path.join(output_dir, _MANIFEST_NAME), data)
+
+
+def _is_up_to_date(json_file: str, output_dir: str, mtime_ns: int,
+                   manifest: Dict[str, int]) -> bool:
+    """Return True if json_file converted successfully at its current mtime.
+
+    Single objects must also still have their .md in output_dir.
+    """
+    name = os.path.basename(json_file)
+    if manifest.get(name) != mtime_ns:
+        return False
+    try:
+        if _is_json_array(json_file):
+            return True
+    except OSError:
+        return False
+    return os.path.isfile(os.path.join(output_dir, name.replace('.json', '.md')))
+
+
+def process_directory(source_dir: str, output_dir: str, count_files: bool = False,
+                      force: bool = False):
+    """Process all JSON files in a directory.
+
+    Unless force is set, files that converted successfully on an earlier
+    run and have not been modified since are skipped.  Successful
+    conversions are recorded in a manifest in each output directory.
+    """
     source_path = Path(source_dir)
     output_path = Path(output_dir)
     
@@ -550,52 +775,121 @@ def process_directory(source_dir: str, output_dir: str):
     # Create output directory
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Find all JSON files
-    json_files = list(source_path.rglob("*.json"))
-    
-    if not json_files:
-        print(f"No JSON files found in {source_dir}")
-        return
-    
     print(f"\nScanning directory for JSON files...")
-    print(f"Found {len(json_files)} JSON files to process")
     
-    # Process files with progress bar
+    # Files are streamed to the workers as they are found; counting them
+    # first is an optional extra pass that gives the progress bar a total
+    expected_files = None
+    if count_files:
+        expected_files = sum(1 for _ in source_path.rglob("*.json"))
+        if not expected_files:
+            print(f"No JSON files found in {source_dir}")
+            return
+        print(f"Found {expected_files} JSON files to process")
+    
+    # Process files in parallel with progress bar
     processed_count = 0
     error_count = 0
+    total_output_files = 0
+    category_counts: Dict[str, int] = collections.Counter()
     start_time = time.time()
     
-    for json_file in tqdm(json_files, desc="Converting files", unit="files"):
-        # Maintain directory structure in output
-        rel_path = json_file.relative_to(source_path)
-        output_file_dir = output_path / rel_path.parent
-        output_file_dir.mkdir(parents=True, exist_ok=True)
-        
-        if process_json_file(str(json_file), str(output_file_dir)):
-            processed_count += 1
-        else:
-            error_count += 1
+    # With a known total, give each worker about eight chunks to balance
+    # overhead and stragglers
+    workers = os.cpu_count() or 1
+    chunksize = 16
+    miniters = None
+    if expected_files:
+        chunksize = max(1, expected_files // (workers * 8))
+        miniters = max(1, expected_files // 200)
+    
+    skipped_count = 0
+    # Per output directory: the manifest from the last run, and the one
+    # written at the end of this run (skipped and succeeded files only)
+    old_manifests: Dict[str, Dict[str, int]] = {}
+    new_manifests: Dict[str, Dict[str, int]] = {}
+    # Output directory and mtime of each dispatched source, taken before
+    # conversion and recorded in the new manifest only on success
+    dispatched: Dict[str, Tuple[str, int]] = {}
+    
+    def pending_tasks() -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Yield the tasks whose output is missing or stale."""
+        nonlocal skipped_count
+        for task in _iter_tasks(source_path, output_path, category_counts):
+            json_file, output_file_dir = task[0], task[1]
+            manifest = old_manifests.get(output_file_dir)
+            if manifest is None:
+                manifest = old_manifests[output_file_dir] = _load_manifest(output_file_dir)
+                new_manifests[output_file_dir] = {}
+            try:
+                mtime_ns = os.stat(json_file).st_mtime_ns
+            except OSError:
+                yield task
+                continue
+            if not force and _is_up_to_date(json_file, output_file_dir,
+                                             mtime_ns, manifest):
+                new_manifests[output_file_dir][os.path.basename(json_file)] = mtime_ns
+                skipped_count += 1
+                continue
+            dispatched[json_file] = (output_file_dir, mtime_ns)
+            yield task
+    
+    with multiprocessing.Pool(workers) as pool:
+        tasks = pending_tasks()
+        results = pool.imap_unordered(_process_task, tasks, chunksize=chunksize)
+        # Redraw the bar a few times a second at most; results arrive in
+        # chunk-sized bursts and per-item redraws would dominate small files
+        progress = tqdm(results, total=expected_files, desc="Converting files",
+                        unit="files", mininterval=0.5, miniters=miniters,
+                        smoothing=0.1)
+        for json_file, success, written, category, messages in progress:
+            total_output_files += written
+            if category is not None:
+                category_counts[category] += written
+            if messages:
+                # Worker output is printed here so it does not interleave
+                tqdm.write(messages, end='')
+            if success:
+                processed_count += 1
+                source = dispatched.get(json_file)
+                if source is not None:
+                    new_manifests[source[0]][os.path.basename(json_file)] = source[1]
+            else:
+                error_count += 1
+        pool.close()
+        pool.join()
     
-    total_time = time.time() - start_time
-    total_files = len(json_files)
+    for output_file_dir, manifest in new_manifests.items():
+        if manifest or old_manifests[output_file_dir]:
+            _write_manifest(output_file_dir, manifest)
     
-    # Count total output files
-    total_output_files = 0
-    for root, dirs, files in os.walk(output_path):
-        total_output_files += len([f for f in files if f.endswith('.md')])
+    total_files = processed_count + error_count + skipped_count
+    if not total_files:
+        print(f"No JSON files found in {source_dir}")
+        return
+    
+    total_time = time.time() - start_time
     
     print(f"\nConversion complete!")
     print(f"Successfully processed: {processed_count} JSON files")
     print(f"Total output files created: {total_output_files}")
     print(f"Errors encountered: {error_count} files")
+    if skipped_count:
+        print(f"Skipped (output up to date): {skipped_count} files")
     print(f"Total time: {total_time:.2f} seconds")
-    print(f"Average time per JSON file: {total_time/total_files:.3f} seconds")
+    converted_files = processed_count + error_count
+    if converted_files:
+        print(f"Average time per JSON file: {total_time/converted_files:.3f} seconds")
     
     if error_count > 0:
         print(f"\nNote: {error_count} files had errors. Check the output above for details.")
     
-    # Print detailed statistics
-    print_detailed_statistics(output_dir)
+    # Print detailed statistics; skipped files wrote nothing this run, so
+    # their existing outputs are only seen by reading the tree back
+    if skipped_count:
+        print_detailed_statistics(output_dir)
+    else:
+        print_detailed_statistics(output_dir, category_counts)
 
 
 def main():
@@ -612,6 +906,16 @@ def main():
         default="cti_markdown_output",
         help="Output directory for markdown files (default: cti_markdown_output)"
     )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Count JSON files before converting to show overall progress"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert every file, even when its markdown is already up to date"
+    )
     
     args = parser.parse_args()
     
@@ -620,7 +924,7 @@ def main():
     print(f"Source directory: {args.source_dir}")
     print(f"Output directory: {args.output_dir}")
     
-    process_directory(args.source_dir, args.output_dir)
+    process_directory(args.source_dir, args.output_dir, args.count, args.force)
 
 
 if __name__ == "__main__":
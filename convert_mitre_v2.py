@@ -8,29 +8,63 @@ and converts them to markdown format while preserving directory structure.
 
 import argparse
 import json
+import multiprocessing
 import os
 import re
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; bundles are then parsed in full
+    ijson = None
+
+# Bundles at least this large only have their first object parsed (needs ijson)
+_MINIMAL_PARSE_MIN_SIZE = 1 << 20
+_NO_OBJECT = object()
+# O_BINARY only exists (and matters) on Windows, where it stops os.write
+# from translating "\n".  Text-mode open() used to write CRLF there; the
+# markdown now has LF line endings on every platform
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+# Successful files between progress-bar postfix updates
+_POSTFIX_EVERY = 64
+# Default chunk size; documents this short are never split
+_CHUNK_MAX_TOKENS = 800
+# Whitespace following sentence-ending punctuation; chunk overlaps split here
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
 
 def clean_text(input_text: str) -> str:
     """Clean and format text for markdown display."""
     if not input_text:
         return "Not specified"
+    if type(input_text) is str:
+        # isprintable() is False for every whitespace character except the
+        # plain space, so text passing these checks is already normalized
+        if (input_text.isprintable() and '  ' not in input_text
+                and input_text[0] != ' ' and input_text[-1] != ' '):
+            return input_text
+    else:
+        input_text = str(input_text)
     # Remove excessive whitespace and normalize
-    return ' '.join(str(input_text).split())
+    return ' '.join(input_text.split())
 
 
 def format_list_items(items: List[str], prefix: str = "-") -> str:
     """Format list items for markdown display with specified prefix."""
     if not items:
         return "Not specified"
-    # Format each item with prefix and join with newlines
-    formatted_items = [f"{prefix} {clean_text(str(item))}" for item in items if item]
+    # Format each item with prefix and join with newlines; clean_text
+    # converts non-string items itself
+    formatted_items = [f"{prefix} {clean_text(item)}" for item in items if item]
     return '\n'.join(formatted_items) if formatted_items else "Not specified"
 
 
@@ -39,7 +73,37 @@ def estimate_tokens(text: str) -> int:
     return len(str(text)) // 4
 
 
-def chunk_text_with_overlap(text: str, max_tokens: int = 800, overlap_ratio: float = 0.22) -> List[str]:
+def _overlap_tail(chunk_text: str, overlap_tokens: int) -> str:
+    """Return the trailing whole sentences of chunk_text within overlap_tokens.
+
+    Sentences are taken from the end backwards until the next one would
+    not fit.  Only a tail window is split; the window's first piece may
+    start mid-sentence, so it doubles whenever every complete sentence in
+    it fits, until it covers the whole text.
+    """
+    window = 4 * overlap_tokens + 64
+    while True:
+        start = max(0, len(chunk_text) - window)
+        sentences = _SENT_SPLIT_RE.split(chunk_text[start:])
+        if start:
+            del sentences[0]
+        
+        # Build overlap from the end backwards
+        kept: List[str] = []
+        overlap_current = 0
+        for sentence in reversed(sentences):
+            sentence_tokens = len(sentence) // 4
+            if overlap_current + sentence_tokens > overlap_tokens:
+                return ' '.join(reversed(kept)).strip()
+            kept.append(sentence)
+            overlap_current += sentence_tokens
+        
+        if not start:
+            return ' '.join(reversed(kept)).strip()
+        window *= 2
+
+
+def chunk_text_with_overlap(text: str, max_tokens: int = _CHUNK_MAX_TOKENS, overlap_ratio: float = 0.22) -> List[str]:
     """
     Split text into overlapping chunks optimized for cybersecurity content.
     
@@ -59,50 +123,45 @@ def chunk_text_with_overlap(text: str, max_tokens: int = 800, overlap_ratio: flo
     paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
     
     chunks = []
-    current_chunk = ""
+    # Paragraphs of the chunk being built, joined only when it is flushed.
+    # current_len is the length the joined text will have
+    current_parts: List[str] = []
+    current_len = 0
     overlap_tokens = int(max_tokens * overlap_ratio)
     
     i = 0
     while i < len(paragraphs):
         paragraph = paragraphs[i]
         paragraph_tokens = estimate_tokens(paragraph)
-        current_tokens = estimate_tokens(current_chunk)
+        current_tokens = current_len // 4
         
         # If adding this paragraph would exceed max_tokens, finalize current chunk
-        if current_tokens + paragraph_tokens > max_tokens and current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_tokens + paragraph_tokens > max_tokens and current_parts:
+            chunk_text = '\n\n'.join(current_parts)
+            chunks.append(chunk_text.strip())
             
             # Create overlap by keeping last part of previous chunk
             if overlap_tokens > 0 and current_tokens > overlap_tokens:
                 # Find a good break point for overlap (preferably at sentence boundary)
-                sentences = re.split(r'(?<=[.!?])\s+', current_chunk)
-                overlap_text = ""
-                overlap_current = 0
-                
-                # Build overlap from the end backwards
-                for sentence in reversed(sentences):
-                    sentence_tokens = estimate_tokens(sentence)
-                    if overlap_current + sentence_tokens <= overlap_tokens:
-                        overlap_text = sentence + " " + overlap_text
-                        overlap_current += sentence_tokens
-                    else:
-                        break
-                
-                current_chunk = overlap_text.strip()
+                overlap_text = _overlap_tail(chunk_text, overlap_tokens)
+                current_parts = [overlap_text] if overlap_text else []
+                current_len = len(overlap_text)
             else:
-                current_chunk = ""
+                current_parts = []
+                current_len = 0
         
         # Add current paragraph
-        if current_chunk:
-            current_chunk += "\n\n" + paragraph
+        if current_parts:
+            current_len += 2 + len(paragraph)
         else:
-            current_chunk = paragraph
+            current_len = len(paragraph)
+        current_parts.append(paragraph)
         
         i += 1
     
     # Add final chunk if it exists
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    if current_parts:
+        chunks.append('\n\n'.join(current_parts).strip())
     
     return chunks
 
@@ -114,6 +173,10 @@ def create_chunked_documents(markdown_content: str, base_filename: str, chunk_in
     Returns:
         List of (filename, content) tuples
     """
+    # Most documents fit in one chunk; skip the chunker's setup for them
+    if isinstance(markdown_content, str) and estimate_tokens(markdown_content) <= _CHUNK_MAX_TOKENS:
+        return [(base_filename, markdown_content)]
+    
     chunks = chunk_text_with_overlap(markdown_content)
     
     if len(chunks) == 1:
@@ -157,14 +220,33 @@ def extract_references(obj: Dict[Any, Any]) -> str:
     return '\n'.join(formatted_refs) if formatted_refs else "No external references available"
 
 
+class MitreObject(NamedTuple):
+    """The fields every typed converter reads from a bundle's first object."""
+    obj: Dict[Any, Any]
+    name: Any
+    external_id: Any
+    description: str
+
+
+def read_mitre_object(data: Dict[Any, Any], default_name: str) -> MitreObject:
+    """Read the first object of a bundle and its common fields in one pass.
+
+    The ID comes from the first external reference, as ATT&CK lists its own
+    reference first.
+    """
+    obj = data.get('objects', [{}])[0]
+    return MitreObject(
+        obj=obj,
+        name=obj.get('name', default_name),
+        external_id=obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID'),
+        description=clean_text(obj.get('description', ''))
+    )
+
+
 def convert_technique_json(data: Dict[Any, Any]) -> str:
     """Convert a technique JSON object to markdown."""
-    obj = data.get('objects', [{}])[0]  # Get first object from STIX bundle
-    
-    # Extract basic information
-    name = obj.get('name', 'Unknown Technique')
-    tech_id = obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID')
-    description = clean_text(obj.get('description', ''))
+    # Extract basic information from the first object of the STIX bundle
+    obj, name, tech_id, description = read_mitre_object(data, 'Unknown Technique')
     
     # Extract platforms and tactics
     platforms = obj.get('x_mitre_platforms', [])
@@ -208,11 +290,7 @@ def convert_technique_json(data: Dict[Any, Any]) -> str:
 
 def convert_mitigation_json(data: Dict[Any, Any]) -> str:
     """Convert a mitigation JSON object to markdown."""
-    obj = data.get('objects', [{}])[0]
-    
-    name = obj.get('name', 'Unknown Mitigation')
-    mit_id = obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID')
-    description = clean_text(obj.get('description', ''))
+    obj, name, mit_id, description = read_mitre_object(data, 'Unknown Mitigation')
     
     markdown_content = f"""# {mit_id}: {name}
 
@@ -231,11 +309,7 @@ def convert_mitigation_json(data: Dict[Any, Any]) -> str:
 
 def convert_group_json(data: Dict[Any, Any]) -> str:
     """Convert a group/threat actor JSON object to markdown."""
-    obj = data.get('objects', [{}])[0]
-    
-    name = obj.get('name', 'Unknown Group')
-    group_id = obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID')
-    description = clean_text(obj.get('description', ''))
+    obj, name, group_id, description = read_mitre_object(data, 'Unknown Group')
     aliases = obj.get('aliases', [])
     
     markdown_content = f"""# {group_id}: {name}
@@ -256,6 +330,37 @@ def convert_group_json(data: Dict[Any, Any]) -> str:
     return markdown_content
 
 
+# Converter type for each STIX object type
+_STIX_TYPE_MAPPING = {
+    'attack-pattern': 'technique',
+    'course-of-action': 'mitigation',
+    'intrusion-set': 'group',
+    'malware': 'software',
+    'tool': 'software',
+    'x-mitre-tactic': 'tactic',
+    'x-mitre-matrix': 'matrix'
+}
+
+# Converter type implied by the first letter of an ATT&CK external ID
+_EXTERNAL_ID_PREFIXES = {
+    'T': 'technique',
+    'M': 'mitigation',
+    'G': 'group',
+    'S': 'software'
+}
+
+# Directory keywords used when the STIX type is not recognised, by priority
+_PATH_TYPE_KEYWORDS = (
+    ('technique', 'technique'),
+    ('mitigation', 'mitigation'),
+    ('group', 'group'),
+    ('software', 'software'),
+    ('tool', 'software'),
+    ('malware', 'software'),
+    ('tactic', 'tactic'),
+)
+
+
 def detect_json_type(data: Dict[Any, Any], file_path: Path = None) -> str:
     """Detect the type of MITRE ATT&CK object from JSON data and file context."""
     if 'objects' not in data or not data['objects']:
@@ -264,50 +369,29 @@ def detect_json_type(data: Dict[Any, Any], file_path: Path = None) -> str:
     obj = data['objects'][0]
     obj_type = obj.get('type', '')
     
-    # Primary detection from STIX object type
-    type_mapping = {
-        'attack-pattern': 'technique',
-        'course-of-action': 'mitigation', 
-        'intrusion-set': 'group',
-        'malware': 'software',
-        'tool': 'software',
-        'x-mitre-tactic': 'tactic',
-        'x-mitre-matrix': 'matrix'
-    }
-    
-    detected_type = type_mapping.get(obj_type, 'unknown')
+    # Primary detection from STIX object type; most objects stop here
+    detected_type = _STIX_TYPE_MAPPING.get(obj_type, 'unknown')
+    if detected_type != 'unknown':
+        return detected_type
     
     # Secondary detection from directory structure if available
-    if file_path and detected_type == 'unknown':
-        path_parts = [part.lower() for part in file_path.parts]
-        
-        if any('technique' in part for part in path_parts):
-            detected_type = 'technique'
-        elif any('mitigation' in part for part in path_parts):
-            detected_type = 'mitigation'
-        elif any('group' in part for part in path_parts):
-            detected_type = 'group'
-        elif any('software' in part or 'tool' in part or 'malware' in part for part in path_parts):
-            detected_type = 'software'
-        elif any('tactic' in part for part in path_parts):
-            detected_type = 'tactic'
+    if file_path:
+        # No keyword contains a path separator, so searching the whole
+        # lowered path finds exactly the keywords found in some part
+        path_text = str(file_path).lower()
+        for keyword, keyword_type in _PATH_TYPE_KEYWORDS:
+            if keyword in path_text:
+                detected_type = keyword_type
+                break
     
     # Tertiary detection from external ID patterns
     if detected_type == 'unknown':
         external_refs = obj.get('external_references', [])
         for ref in external_refs:
             ext_id = ref.get('external_id', '')
-            if ext_id.startswith('T'):
-                detected_type = 'technique'
-                break
-            elif ext_id.startswith('M'):
-                detected_type = 'mitigation'
-                break
-            elif ext_id.startswith('G'):
-                detected_type = 'group'
-                break
-            elif ext_id.startswith('S'):
-                detected_type = 'software'
+            prefix_type = _EXTERNAL_ID_PREFIXES.get(ext_id[:1])
+            if prefix_type:
+                detected_type = prefix_type
                 break
     
     return detected_type
@@ -315,11 +399,7 @@ def detect_json_type(data: Dict[Any, Any], file_path: Path = None) -> str:
 
 def convert_software_json(data: Dict[Any, Any]) -> str:
     """Convert a software/tool/malware JSON object to markdown."""
-    obj = data.get('objects', [{}])[0]
-    
-    name = obj.get('name', 'Unknown Software')
-    software_id = obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID')
-    description = clean_text(obj.get('description', ''))
+    obj, name, software_id, description = read_mitre_object(data, 'Unknown Software')
     labels = obj.get('labels', [])
     platforms = obj.get('x_mitre_platforms', [])
     
@@ -346,11 +426,7 @@ def convert_software_json(data: Dict[Any, Any]) -> str:
 
 def convert_tactic_json(data: Dict[Any, Any]) -> str:
     """Convert a tactic JSON object to markdown."""
-    obj = data.get('objects', [{}])[0]
-    
-    name = obj.get('name', 'Unknown Tactic')
-    tactic_id = obj.get('external_references', [{}])[0].get('external_id', 'Unknown ID')
-    description = clean_text(obj.get('description', ''))
+    obj, name, tactic_id, description = read_mitre_object(data, 'Unknown Tactic')
     short_name = obj.get('x_mitre_shortname', '')
     
     markdown_content = f"""# {tactic_id}: {name}
@@ -371,9 +447,14 @@ def convert_tactic_json(data: Dict[Any, Any]) -> str:
     return markdown_content
 
 
-def convert_json_to_markdown(json_data: Dict[Any, Any], file_path: Path = None) -> str:
-    """Convert JSON data to markdown based on detected type."""
-    json_type = detect_json_type(json_data, file_path)
+def convert_json_to_markdown(json_data: Dict[Any, Any], file_path: Path = None,
+                             json_type: Optional[str] = None) -> str:
+    """Convert JSON data to markdown based on detected type.
+
+    Pass json_type when detect_json_type has already been run on the data.
+    """
+    if json_type is None:
+        json_type = detect_json_type(json_data, file_path)
     
     if json_type == 'technique':
         return convert_technique_json(json_data)
@@ -408,6 +489,116 @@ def convert_json_to_markdown(json_data: Dict[Any, Any], file_path: Path = None)
 """
 
 
+def _iter_json_files(directory: str) -> Iterator[Path]:
+    """Yield the .json files under directory in os.walk order.
+
+    scandir entries carry their file type, so no extra stat() is needed per
+    entry.  Like os.walk, symlinked directories are not followed and
+    unreadable directories are skipped.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    subdirs = []
+    with entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith('.json'):
+                yield Path(entry.path)
+    for subdir in subdirs:
+        yield from _iter_json_files(subdir)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write already-encoded markdown to path, replacing any existing file.
+
+    Goes straight to os.write so small files skip the buffered text layer.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _load_json(json_file: Path) -> Any:
+    """Load a JSON file, using orjson when it is installed.
+
+    orjson reads integers outside the 64-bit range as floats (so
+    123456789012345678901234567890 becomes 1.2345678901234568e+29); the
+    stdlib parser used without orjson keeps them exact.
+    """
+    if orjson is not None:
+        # orjson parses bytes directly, skipping the text-mode decode
+        return orjson.loads(json_file.read_bytes())
+    
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_stix_minimal(json_file: Path) -> Optional[Dict[str, Any]]:
+    """Parse only the first entry of a bundle's 'objects' array.
+
+    The converters never look past objects[0], so large bundles are
+    streamed with ijson until that entry is complete and the rest of the
+    file is left unread.  Returns {'objects': [first]}, or None when the
+    file is not an object holding a non-empty 'objects' array.
+    """
+    with open(json_file, 'rb') as f:
+        if not f.read(256).lstrip(b' \t\r\n').startswith(b'{'):
+            return None
+        f.seek(0)
+        first = next(ijson.items(f, 'objects.item', use_float=True), _NO_OBJECT)
+    if first is _NO_OBJECT:
+        return None
+    return {'objects': [first]}
+
+
+def _load_bundle(json_file: Path) -> Any:
+    """Load what the converters need from a JSON file."""
+    if ijson is not None and json_file.stat().st_size >= _MINIMAL_PARSE_MIN_SIZE:
+        data = parse_stix_minimal(json_file)
+        if data is not None:
+            return data
+    return _load_json(json_file)
+
+
+def _convert_one(task: Tuple[str, str, str]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Pool worker: convert one JSON file to markdown.
+
+    Takes (source_file, output_file, relative_name) and returns
+    (relative_name, detected_type, error), with error None on success.
+    """
+    source_file, output_file, relative_name = task
+    source_path = Path(source_file)
+    try:
+        # Read and parse JSON
+        json_data = _load_bundle(source_path)
+        
+        # Detect once; the type is also shown for user feedback
+        detected_type = detect_json_type(json_data, source_path)
+        
+        # Convert to markdown
+        markdown_content = convert_json_to_markdown(json_data, source_path, detected_type)
+        
+        # Write markdown file
+        _write_bytes(output_file, markdown_content.encode('utf-8'))
+        
+        return relative_name, detected_type, None
+    
+    except Exception as e:
+        return relative_name, None, str(e)
+
+
 def process_directory(source_dir: str, output_dir: str):
     """Process all JSON files in source directory and convert to markdown."""
     source_path = Path(source_dir)
@@ -422,11 +613,7 @@ def process_directory(source_dir: str, output_dir: str):
     
     # First pass: count total JSON files for progress bar
     print("Scanning directory for JSON files...")
-    json_files = []
-    for root, dirs, files in os.walk(source_path):
-        for file in files:
-            if file.endswith('.json'):
-                json_files.append(Path(root) / file)
+    json_files = list(_iter_json_files(str(source_path)))
     
     total_files = len(json_files)
     if total_files == 0:
@@ -435,66 +622,70 @@ def process_directory(source_dir: str, output_dir: str):
     
     print(f"Found {total_files} JSON files to process")
     
+    # Output subdirectories are created here, once each, so worker processes
+    # never race on mkdir
+    tasks = []
+    output_subdirs = set()
+    for source_file in json_files:
+        # Calculate relative path from source directory
+        relative_path = source_file.relative_to(source_path)
+        
+        # Create corresponding output path with .md extension
+        output_file = output_path / relative_path.with_suffix('.md')
+        output_subdirs.add(output_file.parent)
+        tasks.append((str(source_file), str(output_file), str(relative_path)))
+    
+    for output_subdir in output_subdirs:
+        output_subdir.mkdir(parents=True, exist_ok=True)
+    
     processed_count = 0
     error_count = 0
     start_time = time.time()
     
-    # Process files with progress bar
-    with tqdm(total=total_files, desc="Converting files", unit="files") as pbar:
-        for source_file in json_files:
-            # Calculate relative path from source directory
-            relative_path = source_file.relative_to(source_path)
-            
-            # Create corresponding output path with .md extension
-            output_file = output_path / relative_path.with_suffix('.md')
-            
-            # Create output subdirectory if needed
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            try:
-                # Read and parse JSON
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                # Convert to markdown
-                markdown_content = convert_json_to_markdown(json_data, source_file)
-                
-                # Write markdown file
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-                
-                # Show what type was detected for user feedback
-                detected_type = detect_json_type(json_data, source_file)
-                
+    # Give each worker about eight chunks to balance overhead and stragglers
+    workers = os.cpu_count() or 1
+    chunksize = max(1, total_files // (workers * 8))
+    
+    # Process files in parallel with progress bar
+    with multiprocessing.Pool(workers) as pool, \
+            tqdm(total=total_files, desc="Converting files", unit="files",
+                 mininterval=0.5) as pbar:
+        results = pool.imap_unordered(_convert_one, tasks, chunksize=chunksize)
+        for relative_name, detected_type, error in results:
+            if error is None:
                 processed_count += 1
                 
-                # Update progress bar with current file info
-                pbar.set_postfix({
-                    'current': relative_path.name[:20] + "..." if len(relative_path.name) > 20 else relative_path.name,
-                    'type': detected_type,
-                    'errors': error_count
-                })
+                # Update progress bar with current file info every few files;
+                # the bar itself redraws at most every mininterval seconds
+                if processed_count % _POSTFIX_EVERY == 1:
+                    file_name = os.path.basename(relative_name)
+                    pbar.set_postfix({
+                        'current': file_name[:20] + "..." if len(file_name) > 20 else file_name,
+                        'type': detected_type,
+                        'errors': error_count
+                    }, refresh=False)
                 pbar.update(1)
-                
-            except Exception as e:
+            else:
                 error_count += 1
+                file_name = os.path.basename(relative_name)
                 pbar.set_postfix({
-                    'current': f"ERROR: {relative_path.name[:15]}...",
+                    'current': f"ERROR: {file_name[:15]}...",
                     'errors': error_count
-                })
+                }, refresh=False)
                 pbar.update(1)
                 
                 # Log error details to a separate line (so it doesn't mess up progress bar)
-                tqdm.write(f"Error processing {relative_path}: {str(e)}")
+                tqdm.write(f"Error processing {relative_name}: {error}")
+        pool.close()
+        pool.join()
     
     # Final statistics
     end_time = time.time()
     total_time = end_time - start_time
     
-    # Count total output files (including chunks)
-    total_output_files = 0
-    for root, dirs, files in os.walk(output_path):
-        total_output_files += len([f for f in files if f.endswith('.md')])
+    # Count total output files (including chunks) and the per-category
+    # statistics in a single pass over the output tree
+    total_output_files, category_counts = _scan_output(str(output_path))
     
     print(f"\nConversion complete!")
     print(f"Successfully processed: {processed_count} JSON files")
@@ -510,27 +701,103 @@ def process_directory(source_dir: str, output_dir: str):
         print(f"\nNote: {error_count} files had errors. Check the output above for details.")
     
     # Print detailed statistics
-    print_detailed_statistics(output_dir)
+    print_detailed_statistics(output_dir, category_counts)
 
 
 
-def print_detailed_statistics(output_path: str):
-    """Print detailed statistics about the converted files."""
-    from pathlib import Path
-    import os
-    
+def _is_listed_category(name: str) -> bool:
+    """Return True for output subdirectories shown in the statistics."""
+    # Excludes any __pycache__ or temp directories
+    return (not name.startswith('__') and not name.startswith('.')
+            and name not in ['my_custom_output'])
+
+
+def _count_md_files(directory: str, walk: bool = True) -> Tuple[int, int]:
+    """Count markdown entries in one scandir pass per directory.
+
+    Returns the number of names ending in .md directly inside directory,
+    and the number of .md files anywhere under it as os.walk lists them
+    (only directly inside when walk is False).  Unreadable directories
+    count as empty.
+    """
+    direct = 0
+    total = 0
+    subdirs = []
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return 0, 0
+    with entries:
+        for entry in entries:
+            is_md = entry.name.endswith('.md')
+            if is_md:
+                direct += 1
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if walk and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif is_md:
+                total += 1
+    for subdir in subdirs:
+        total += _count_md_files(subdir)[1]
+    return direct, total
+
+
+def _scan_output(output_path: str) -> Tuple[int, Dict[str, int]]:
+    """Count markdown output in one walk of output_path.
+
+    Returns the number of .md files in the whole tree and the counts for
+    print_detailed_statistics: each listed top-level directory maps to the
+    .md entries directly inside it, and '' to the root-level .md files.
+    """
+    total = 0
+    category_counts = {'': 0}
+    with os.scandir(output_path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                if entry.name.endswith('.md'):
+                    total += 1
+                    if entry.is_file():
+                        category_counts[''] += 1
+                continue
+            
+            listed = _is_listed_category(entry.name)
+            # Symlinked directories are listed but not walked
+            walk = not entry.is_symlink()
+            if listed or walk:
+                direct, tree_total = _count_md_files(entry.path, walk)
+                if listed:
+                    category_counts[entry.name] = direct
+                if walk:
+                    total += tree_total
+    return total, category_counts
+
+
+def print_detailed_statistics(output_path: str,
+                              category_counts: Optional[Dict[str, int]] = None):
+    """Print detailed statistics about the converted files.
+
+    category_counts maps each top-level output directory to the number of
+    .md files directly inside it ('' for the root level), as returned by
+    _scan_output. When it is not given the output directory is scanned.
+    """
     print("\n" + "=" * 60)
     print("CONVERSION STATISTICS")
     print("=" * 60)
     
-    # Get all subdirectories (excluding any __pycache__ or temp directories)
-    subdirs = []
-    for item in os.listdir(output_path):
-        item_path = os.path.join(output_path, item)
-        if os.path.isdir(item_path) and not item.startswith('__') and not item.startswith('.') and item not in ['my_custom_output']:
-            subdirs.append(item)
+    if category_counts is None:
+        category_counts = _scan_output(output_path)[1]
     
-    subdirs.sort()
+    # Get all subdirectories (excluding any __pycache__ or temp directories)
+    subdirs = sorted(name for name in category_counts
+                     if name and _is_listed_category(name))
     
     print("\nDirectories created:")
     for subdir in subdirs:
@@ -540,20 +807,16 @@ def print_detailed_statistics(output_path: str):
     total_md_files = 0
     category_stats = []
     
-    # Count files in each directory
     for subdir in subdirs:
-        subdir_path = os.path.join(output_path, subdir)
-        md_files = [f for f in os.listdir(subdir_path) if f.endswith('.md')]
-        count = len(md_files)
+        count = category_counts[subdir]
         total_md_files += count
         category_stats.append((subdir, count))
         print(f"  {subdir}: {count} files")
     
-    # Count root-level .md files
-    root_md_files = [f for f in os.listdir(output_path) if f.endswith('.md') and os.path.isfile(os.path.join(output_path, f))]
-    if root_md_files:
-        print(f"  Root level: {len(root_md_files)} files")
-        total_md_files += len(root_md_files)
+    root_count = category_counts.get('', 0)
+    if root_count:
+        print(f"  Root level: {root_count} files")
+        total_md_files += root_count
     
     print(f"\nTotal markdown files: {total_md_files}")
     